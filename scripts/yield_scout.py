@@ -1,19 +1,60 @@
 #!/usr/bin/env python3
 """DeFi Yield Scout — USDC yield farming scanner for Base & Arbitrum.
 
-Uses DeFiLlama's free API. Stdlib only (no pip installs).
+Uses DeFiLlama's free API. Stdlib only (no pip installs); picks up orjson
+(faster JSON), numpy (vectorized stats/filtering), and ijson (streaming
+parse) if they happen to be installed.
 """
 
 import argparse
+import bisect
+import collections
+import concurrent.futures
+import functools
+import heapq
+import http.client
+import io
 import json
 import math
 import os
+import pickle
 import ssl
 import sys
 import tempfile
+import threading
 import time
+import urllib.error
+import urllib.parse
 import urllib.request
 
+try:
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps(obj):
+        return orjson.dumps(obj)
+
+except ImportError:
+    orjson = None
+
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
@@ -22,9 +63,13 @@ POOLS_URL = "https://yields.llama.fi/pools"
 CHART_URL = "https://yields.llama.fi/chart/{pool_id}"
 
 CACHE_PATH = os.path.join(tempfile.gettempdir(), "yield_scout_pools.json")
+PICKLE_PATH = os.path.join(tempfile.gettempdir(), "yield_scout_pools.pkl")
+PICKLE_VERSION = 3  # bump when the cached pool/index schema changes
+META_PATH = os.path.join(tempfile.gettempdir(), "yield_scout_pools.meta.json")
 CACHE_TTL = 900  # 15 minutes
 
 CHAINS = {"base": "Base", "arbitrum": "Arbitrum"}
+_CHAINS_SET = frozenset(CHAINS.values())
 
 USDC_ADDRESSES = {
     "Base": ["0x833589fcd6edb6e08f4c7c32d4f71b54bda02913"],
@@ -52,6 +97,16 @@ WHITELISTED_PROTOCOLS = {
 COST_SAME_CHAIN = 0.01
 COST_CROSS_CHAIN = 0.03
 
+# Table rules, built once instead of per command
+RULE_WIDE = "\u2501" * 100
+RULE_MID = "\u2501" * 70
+RULE_NARROW = "\u2501" * 60
+
+# Row templates as module constants: str.format caches the parsed field
+# specs on the string object, so rows skip per-iteration f-string assembly
+_SCAN_ROW_FMT = " {i:>2}  {project:<20} {chain:<10} {symbol:<24} {apy:>7}  {tvl:>9}  {risk:<5}  {pid}"
+_PROTO_ROW_FMT = "  {name:<22} {chains:<20} {standard:<26} {audits:<30}"
+
 # ---------------------------------------------------------------------------
 # HTTP helpers
 # ---------------------------------------------------------------------------
@@ -66,10 +121,78 @@ def _get_ssl_ctx():
     return _ssl_ctx
 
 
+# Keep-alive connections, one per (thread, host): amortizes the TLS
+# handshake across requests and keeps ThreadPoolExecutor workers from
+# contending for a single socket.
+_conns = threading.local()
+
+
+def _get_conn(host, timeout):
+    by_host = getattr(_conns, "by_host", None)
+    if by_host is None:
+        by_host = _conns.by_host = {}
+    conn = by_host.get(host)
+    if conn is None:
+        conn = by_host[host] = http.client.HTTPSConnection(
+            host, context=_get_ssl_ctx(), timeout=timeout
+        )
+    elif conn.sock is not None:
+        conn.sock.settimeout(timeout)
+    return conn
+
+
+def _drop_conn(host):
+    conn = getattr(_conns, "by_host", {}).pop(host, None)
+    if conn is not None:
+        conn.close()
+
+
+def fetch_bytes(url, timeout=60, extra_headers=None, max_redirects=3):
+    """GET url over a kept-alive connection, returning (status, headers,
+    body). A 304 comes back as (304, headers, b'') instead of raising."""
+    parsed = urllib.parse.urlsplit(url)
+    path = parsed.path + ("?" + parsed.query if parsed.query else "")
+    headers = {"User-Agent": "yield-scout/1.0"}
+    if extra_headers:
+        headers.update(extra_headers)
+
+    for attempt in (0, 1):
+        conn = _get_conn(parsed.netloc, timeout)
+        try:
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (http.client.HTTPException, ConnectionError, ssl.SSLError, OSError):
+            # Stale keep-alive socket — rebuild once, then give up.
+            _drop_conn(parsed.netloc)
+            if attempt:
+                raise
+            continue
+
+        if resp.will_close:
+            _drop_conn(parsed.netloc)
+        if resp.status == 304:
+            return 304, resp.headers, b""
+        if 300 <= resp.status < 400:
+            # urlopen followed redirects for us; keep doing that here
+            location = resp.headers.get("Location")
+            if location and max_redirects > 0:
+                return fetch_bytes(
+                    urllib.parse.urljoin(url, location),
+                    timeout=timeout,
+                    extra_headers=extra_headers,
+                    max_redirects=max_redirects - 1,
+                )
+        if not 200 <= resp.status < 300:
+            raise urllib.error.HTTPError(
+                url, resp.status, resp.reason, resp.headers, io.BytesIO(body)
+            )
+        return resp.status, resp.headers, body
+
+
 def fetch_json(url, timeout=60):
-    req = urllib.request.Request(url, headers={"User-Agent": "yield-scout/1.0"})
-    with urllib.request.urlopen(req, context=_get_ssl_ctx(), timeout=timeout) as resp:
-        return json.loads(resp.read().decode())
+    _, _, body = fetch_bytes(url, timeout=timeout)
+    return _loads(body)
 
 
 # ---------------------------------------------------------------------------
@@ -77,21 +200,238 @@ def fetch_json(url, timeout=60):
 # ---------------------------------------------------------------------------
 
 
+def _load_meta():
+    try:
+        with open(META_PATH, "rb") as f:
+            return _loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_meta(headers):
+    meta = {
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "mtime": time.time(),
+    }
+    with open(META_PATH, "wb") as f:
+        f.write(_dumps(meta))
+
+
+# Minimal fields kept for non-whitelisted pools so breakeven lookups by
+# arbitrary pool ID still resolve without caching the full ~MB blob.
+_MINIMAL_FIELDS = ("pool", "project", "chain", "symbol", "apy")
+
+
+def _minimal_record(pool):
+    return {k: pool.get(k) for k in _MINIMAL_FIELDS}
+
+
+def _split_pools(raw_pools):
+    """Split the raw pool list into whitelisted USDC survivors plus a
+    minimal by-id map of everything else."""
+    survivors = []
+    by_id = {}
+    for p in raw_pools:
+        if is_usdc_pool(p):
+            survivors.append(p)
+        else:
+            pid = p.get("pool")
+            if pid:
+                by_id[pid] = _minimal_record(p)
+    return survivors, by_id
+
+
+def _fetch_pools(cond_headers=None):
+    """Download /pools, filtering during the parse when ijson is available
+    so the full 40k-entry list never materializes in memory."""
+    headers = {"User-Agent": "yield-scout/1.0"}
+    if cond_headers:
+        headers.update(cond_headers)
+    req = urllib.request.Request(POOLS_URL, headers=headers)
+    try:
+        with urllib.request.urlopen(req, context=_get_ssl_ctx(), timeout=120) as resp:
+            if ijson is not None:
+                survivors = []
+                by_id = {}
+                # use_float keeps numerics as float — ijson's default
+                # Decimals would poison the pickle cache and break orjson
+                for p in ijson.items(resp, "data.item", use_float=True):
+                    if is_usdc_pool(p):
+                        survivors.append(p)
+                    else:
+                        pid = p.get("pool")
+                        if pid:
+                            by_id[pid] = _minimal_record(p)
+                return resp.status, resp.headers, survivors, by_id
+            data = _loads(resp.read())
+            raw = data.get("data", data) if isinstance(data, dict) else data
+            survivors, by_id = _split_pools(raw)
+            return resp.status, resp.headers, survivors, by_id
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, e.headers, None, None
+        raise
+
+
+def _read_cache():
+    with open(CACHE_PATH, "rb") as f:
+        blob = _loads(f.read())
+    if isinstance(blob, dict) and "pools" in blob:
+        return blob["pools"], blob["by_id"]
+    # Legacy cache holding the raw unfiltered list
+    return _split_pools(blob)
+
+
+def _load_cached():
+    """Load (pools, index) from the best available cache file, or None.
+
+    The pickle cache skips both JSON tokenization and re-indexing; the
+    JSON cache is kept as a read-only fallback for the migration period.
+    """
+    try:
+        with open(PICKLE_PATH, "rb") as f:
+            blob = pickle.load(f)
+        if blob.get("version") == PICKLE_VERSION:
+            return blob["pools"], blob["index"]
+    # ImportError covers a pickle written with numpy installed (the index
+    # holds ndarray columns) being read by an environment without it;
+    # AttributeError covers a non-dict blob at blob.get().
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError, ImportError, AttributeError):
+        pass
+    try:
+        pools, by_id = _read_cache()
+    except (OSError, ValueError):
+        return None
+    return pools, index_pools(pools, by_id)
+
+
+def index_pools(pools, extra_by_id=None):
+    """Build lookup structures once so subcommands avoid repeated O(N) scans.
+
+    extra_by_id carries minimal records for pools outside the whitelist so
+    breakeven lookups still resolve; survivors overlay their full records.
+    """
+    by_id = dict(extra_by_id) if extra_by_id else {}
+    by_chain_project = collections.defaultdict(list)
+    usdc = []
+    for p in pools:
+        pid = p.get("pool")
+        if pid:
+            by_id[pid] = p
+        if is_usdc_pool(p):
+            usdc.append(p)
+            by_chain_project[(p["chain"], p["project"])].append(p)
+    # Normalize the numeric fields once — hot loops then read plain floats
+    # and bools instead of repeating the `.get(k, 0) or 0` defensive dance.
+    for p in usdc:
+        p["_apy"] = p.get("apy") or 0.0
+        p["_tvl"] = p.get("tvlUsd") or 0.0
+        p["_il"] = p.get("ilRisk", "no") == "yes"
+        pred = p.get("predictions") or {}
+        p["_pred_down"] = pred.get("predictedClass", "") in ("Down", "")
+        p["_risk"] = risk_score(p)
+
+    index = {
+        "by_id": by_id,
+        "sorted_ids": sorted(by_id),
+        "usdc": usdc,
+        "by_chain_project": by_chain_project,
+    }
+    if np is not None and usdc:
+        # Column arrays aligned with usdc, for vectorized filter/rank sweeps
+        index["tvl"] = np.array([p["_tvl"] for p in usdc], dtype=np.float64)
+        index["apy"] = np.array([p["_apy"] for p in usdc], dtype=np.float64)
+    return index
+
+
+def _stat_cache():
+    """Find the newest-format cache file with one os.stat per candidate,
+    instead of separate exists/getmtime syscall pairs."""
+    for path in (PICKLE_PATH, CACHE_PATH):
+        try:
+            return path, os.stat(path)
+        except FileNotFoundError:
+            continue
+    return None, None
+
+
 def load_pools(force=False):
-    if not force and os.path.exists(CACHE_PATH):
-        age = time.time() - os.path.getmtime(CACHE_PATH)
-        if age < CACHE_TTL:
-            with open(CACHE_PATH, "r") as f:
-                return json.load(f)
+    cache_path, st = _stat_cache()
+    have_cache = st is not None
+    if not force and have_cache:
+        if time.time() - st.st_mtime < CACHE_TTL:
+            cached = _load_cached()
+            if cached is not None:
+                return cached
 
     print("Fetching pool data from DeFiLlama (this may take a moment)...", file=sys.stderr)
-    data = fetch_json(POOLS_URL, timeout=120)
-    pools = data.get("data", data) if isinstance(data, dict) else data
 
-    with open(CACHE_PATH, "w") as f:
-        json.dump(pools, f)
+    # Ask upstream whether the blob actually changed since we cached it —
+    # a 304 lets us skip the multi-MB transfer and re-parse entirely.
+    cond_headers = {}
+    if have_cache and not force:
+        meta = _load_meta()
+        if meta.get("etag"):
+            cond_headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            cond_headers["If-Modified-Since"] = meta["last_modified"]
+
+    status, headers, pools, by_id = _fetch_pools(cond_headers or None)
+    if status == 304:
+        cached = _load_cached()
+        if cached is not None:
+            os.utime(cache_path, None)  # restart the TTL clock
+            return cached
+        # cache vanished between the stat and the 304 — fetch for real
+        status, headers, pools, by_id = _fetch_pools()
+
+    index = index_pools(pools, by_id)
+
+    # The filtered pickle is 10-100x smaller than the raw blob and loads
+    # without re-tokenizing JSON or rebuilding the index.
+    with open(PICKLE_PATH, "wb") as f:
+        pickle.dump(
+            {
+                "version": PICKLE_VERSION,
+                "fetched_at": time.time(),
+                "pools": pools,
+                "by_id": by_id,
+                "index": index,
+            },
+            f,
+            protocol=5,
+        )
+    _save_meta(headers)
+
+    return pools, index
 
-    return pools
+
+def _chart_cache_path(pool_id):
+    return os.path.join(tempfile.gettempdir(), f"yield_scout_chart_{pool_id}.json")
+
+
+def fetch_history(pool_id):
+    """Fetch the chart for one pool, with the same TTL cache as the pool list."""
+    path = _chart_cache_path(pool_id)
+    try:
+        if time.time() - os.path.getmtime(path) < CACHE_TTL:
+            with open(path, "rb") as f:
+                return _loads(f.read())
+    except OSError:
+        pass
+
+    data = fetch_json(CHART_URL.format(pool_id=pool_id))
+    points = data.get("data", data) if isinstance(data, dict) else data
+    with open(path, "wb") as f:
+        f.write(_dumps(points))
+    return points
+
+
+def fetch_histories(pool_ids, max_workers=8):
+    """Fetch charts for many pools concurrently (the API is I/O-bound)."""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
+        return dict(zip(pool_ids, ex.map(fetch_history, pool_ids)))
 
 
 # ---------------------------------------------------------------------------
@@ -100,48 +440,66 @@ def load_pools(force=False):
 
 
 def is_usdc_pool(pool):
-    """Check if pool is a USDC pool on a whitelisted chain + protocol."""
-    chain = pool.get("chain", "")
-    if chain not in CHAINS.values():
+    """Check if pool is a USDC pool on a whitelisted chain + protocol.
+
+    Runs once per pool over the full ~40k-entry list, so reject on the
+    cheap set-membership tests first and avoid redundant dict lookups.
+    """
+    if pool.get("chain") not in _CHAINS_SET:
         return False
 
-    project = pool.get("project", "")
-    if project not in WHITELISTED_PROTOCOLS:
+    if pool.get("project") not in WHITELISTED_PROTOCOLS:
         return False
 
     # Must be stablecoin
-    if not pool.get("stablecoin", False):
+    if not pool.get("stablecoin"):
         return False
 
-    # Check symbol contains USDC
-    symbol = (pool.get("symbol") or "").upper()
-    if "USDC" not in symbol:
+    # Check symbol contains USDC; the upper-cased symbol is cached on the
+    # pool dict so later passes skip the .upper() allocation.
+    sym = pool.get("_sym_u")
+    if sym is None:
+        sym = pool["_sym_u"] = (pool.get("symbol") or "").upper()
+    if "USDC" not in sym:
         return False
 
     # Prefer single-exposure pools (no multi-asset LP)
-    exposure = pool.get("exposure", "single")
-    if exposure == "multi":
-        return False
-
-    return True
-
+    return pool.get("exposure", "single") != "multi"
+
+
+def filter_pools(index, chain=None, protocol=None, min_tvl=0, top=None):
+    if chain and protocol:
+        # Both filters known up front — grab the bucket directly.
+        key = (CHAINS.get(chain.lower(), chain), protocol)
+        candidates = index["by_chain_project"].get(key, [])
+    elif not chain and not protocol and np is not None and "tvl" in index:
+        # Unfiltered sweep: one vectorized compare + argsort over the
+        # column arrays instead of a per-pool Python loop.
+        keep = np.nonzero(index["tvl"] >= min_tvl)[0]
+        order = keep[np.argsort(-index["apy"][keep], kind="stable")]
+        if top is not None:
+            order = order[:top]
+        usdc = index["usdc"]
+        return [usdc[i] for i in order]
+    else:
+        candidates = index["usdc"]
 
-def filter_pools(pools, chain=None, protocol=None, min_tvl=0):
     results = []
-    for p in pools:
-        if not is_usdc_pool(p):
-            continue
+    for p in candidates:
         if chain and p.get("chain", "").lower() != chain.lower():
             continue
         if protocol and p.get("project", "") != protocol:
             continue
-        tvl = p.get("tvlUsd", 0) or 0
-        if tvl < min_tvl:
+        if p["_tvl"] < min_tvl:
             continue
         results.append(p)
 
-    results.sort(key=lambda x: x.get("apy", 0) or 0, reverse=True)
-    return results
+    if top is not None and top < len(results) // 4:
+        # Partial sort: O(N log top) beats the full O(N log N) sort when
+        # only a small slice is wanted (nlargest keeps the stable order).
+        return heapq.nlargest(top, results, key=lambda x: x["_apy"])
+    results.sort(key=lambda x: x["_apy"], reverse=True)
+    return results if top is None else results[:top]
 
 
 # ---------------------------------------------------------------------------
@@ -149,17 +507,30 @@ def filter_pools(pools, chain=None, protocol=None, min_tvl=0):
 # ---------------------------------------------------------------------------
 
 
+def _json_out(obj):
+    """Pretty-print obj as JSON for --json output.
+
+    orjson serializes straight to bytes, so we write to sys.stdout.buffer
+    and skip the intermediate str that json.dumps(indent=2) would build.
+    """
+    if orjson is not None:
+        sys.stdout.buffer.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        sys.stdout.buffer.write(b"\n")
+    else:
+        print(json.dumps(obj, indent=2))
+
+
+_MAGNITUDES = ((1e9, "B"), (1e6, "M"), (1e3, "K"))
+
+
 def fmt_usd(val):
     if val is None:
         return "N/A"
     abs_val = abs(val)
     sign = "-" if val < 0 else ""
-    if abs_val >= 1_000_000_000:
-        return f"{sign}${abs_val / 1_000_000_000:.1f}B"
-    if abs_val >= 1_000_000:
-        return f"{sign}${abs_val / 1_000_000:.1f}M"
-    if abs_val >= 1_000:
-        return f"{sign}${abs_val / 1_000:.1f}K"
+    for scale, suffix in _MAGNITUDES:
+        if abs_val >= scale:
+            return f"{sign}${abs_val / scale:.1f}{suffix}"
     return f"{sign}${abs_val:.0f}"
 
 
@@ -170,14 +541,20 @@ def fmt_pct(val):
 
 
 def risk_score(pool):
-    tvl = pool.get("tvlUsd", 0) or 0
-    il_risk = pool.get("ilRisk", "no")
-    pred = pool.get("predictions", {}) or {}
-    pred_class = pred.get("predictedClass", "")
+    tvl = pool.get("_tvl")
+    if tvl is not None:
+        il_risk = pool["_il"]
+        pred_down = pool["_pred_down"]
+    else:
+        # Pool hasn't been through index_pools — read the raw fields.
+        tvl = pool.get("tvlUsd", 0) or 0
+        il_risk = pool.get("ilRisk", "no") == "yes"
+        pred = pool.get("predictions", {}) or {}
+        pred_down = pred.get("predictedClass", "") in ("Down", "")
 
-    if tvl < 500_000 or il_risk == "yes":
+    if tvl < 500_000 or il_risk:
         return "HIGH"
-    if tvl < 5_000_000 or pred_class in ("Down", ""):
+    if tvl < 5_000_000 or pred_down:
         return "MED"
     return "LOW"
 
@@ -195,6 +572,9 @@ def sparkline(values):
     lo = min(values)
     hi = max(values)
     rng = hi - lo if hi != lo else 1
+    if np is not None:
+        idx = np.clip(((np.asarray(values, dtype=np.float64) - lo) / rng * 7).astype(int) + 1, 0, 8)
+        return "".join(bars[i] for i in idx)
     return "".join(bars[min(int((v - lo) / rng * 7) + 1, 8)] for v in values)
 
 
@@ -204,25 +584,29 @@ def sparkline(values):
 
 
 def cmd_scan(args):
-    pools = load_pools()
+    _, index = load_pools()
     filtered = filter_pools(
-        pools,
+        index,
         chain=args.chain,
         protocol=args.protocol,
         min_tvl=args.min_tvl,
+        top=args.top or 20,
     )
 
-    top = args.top or 20
-    filtered = filtered[:top]
-
     if not filtered:
         print("No USDC pools found matching your filters.")
         return
 
+    histories = {}
+    if args.enrich:
+        ids = [p.get("pool") for p in filtered if p.get("pool")]
+        print(f"Fetching 30-day history for {len(ids)} pools...", file=sys.stderr)
+        histories = fetch_histories(ids)
+
     if args.json:
         out = []
         for p in filtered:
-            out.append({
+            entry = {
                 "pool": p.get("pool"),
                 "project": p.get("project"),
                 "chain": p.get("chain"),
@@ -231,32 +615,44 @@ def cmd_scan(args):
                 "apyBase": p.get("apyBase"),
                 "apyReward": p.get("apyReward"),
                 "tvlUsd": p.get("tvlUsd"),
-                "risk": risk_score(p),
-            })
-        print(json.dumps(out, indent=2))
+                "risk": p["_risk"],
+            }
+            hist = histories.get(p.get("pool"))
+            if hist:
+                apys = [pt.get("apy", 0) or 0 for pt in hist[-30:]]
+                entry["apyMean30d"] = round(sum(apys) / len(apys), 4) if apys else None
+            out.append(entry)
+        _json_out(out)
         return
 
     chains_label = args.chain or "Base + Arbitrum"
-    print(f"\nDeFi Yield Scout \u2014 USDC Opportunities ({chains_label})")
-    print("\u2501" * 100)
-    hdr = f" {'#':>2}  {'Protocol':<20} {'Chain':<10} {'Pool':<24} {'APY':>7}  {'TVL':>9}  {'Risk':<5}  Pool ID"
-    print(hdr)
-    print("\u2501" * 100)
+    # Build the whole table and emit it with a single write \u2014 one syscall
+    # instead of one per row on a line-buffered tty.
+    lines = [
+        f"\nDeFi Yield Scout \u2014 USDC Opportunities ({chains_label})",
+        RULE_WIDE,
+        f" {'#':>2}  {'Protocol':<20} {'Chain':<10} {'Pool':<24} {'APY':>7}  {'TVL':>9}  {'Risk':<5}  Pool ID",
+        RULE_WIDE,
+    ]
 
     for i, p in enumerate(filtered, 1):
-        row = (
-            f" {i:>2}  "
-            f"{p.get('project', ''):<20} "
-            f"{p.get('chain', ''):<10} "
-            f"{(p.get('symbol') or '')[:24]:<24} "
-            f"{fmt_pct(p.get('apy')):>7}  "
-            f"{fmt_usd(p.get('tvlUsd')):>9}  "
-            f"{risk_score(p):<5}  "
-            f"{short_id(p.get('pool'))}"
+        row = _SCAN_ROW_FMT.format(
+            i=i,
+            project=p.get("project", ""),
+            chain=p.get("chain", ""),
+            symbol=(p.get("symbol") or "")[:24],
+            apy=fmt_pct(p.get("apy")),
+            tvl=fmt_usd(p.get("tvlUsd")),
+            risk=p["_risk"],
+            pid=short_id(p.get("pool")),
         )
-        print(row)
+        hist = histories.get(p.get("pool"))
+        if hist:
+            row += "  " + sparkline([pt.get("apy", 0) or 0 for pt in hist[-10:]])
+        lines.append(row)
 
-    print(f"\n{len(filtered)} pools shown. Use pool IDs with 'breakeven' or 'history' commands.")
+    lines.append(f"\n{len(filtered)} pools shown. Use pool IDs with 'breakeven' or 'history' commands.")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 # ---------------------------------------------------------------------------
@@ -264,19 +660,24 @@ def cmd_scan(args):
 # ---------------------------------------------------------------------------
 
 
-def find_pool_by_id(pools, pool_id):
+def find_pool_by_id(index, pool_id):
     pool_id = pool_id.rstrip(".")  # handle truncated IDs from scan output
-    for p in pools:
-        pid = p.get("pool", "")
-        if pid == pool_id or pid.startswith(pool_id):
-            return p
+    exact = index["by_id"].get(pool_id)
+    if exact is not None:
+        return exact
+    # Prefix match via bisect: the first ID >= the prefix either starts
+    # with it or no ID does. (get() guards pickles from older versions.)
+    sorted_ids = index.get("sorted_ids") or sorted(index["by_id"])
+    i = bisect.bisect_left(sorted_ids, pool_id)
+    if i < len(sorted_ids) and sorted_ids[i].startswith(pool_id):
+        return index["by_id"][sorted_ids[i]]
     return None
 
 
 def cmd_breakeven(args):
-    pools = load_pools()
-    pool_a = find_pool_by_id(pools, args.from_pool)
-    pool_b = find_pool_by_id(pools, args.to_pool)
+    _, index = load_pools()
+    pool_a = find_pool_by_id(index, args.from_pool)
+    pool_b = find_pool_by_id(index, args.to_pool)
 
     if not pool_a:
         print(f"Error: could not find pool '{args.from_pool}'", file=sys.stderr)
@@ -311,7 +712,7 @@ def cmd_breakeven(args):
             verdict = "NO-GO"
 
     if args.json:
-        print(json.dumps({
+        _json_out({
             "from": {
                 "pool": pool_a.get("pool"),
                 "project": pool_a.get("project"),
@@ -333,17 +734,17 @@ def cmd_breakeven(args):
             "dailyGain": daily_gain,
             "breakeven_days": None if math.isinf(breakeven_days) else round(breakeven_days, 1),
             "verdict": verdict,
-        }, indent=2))
+        })
         return
 
     move_type = "same-chain" if same_chain else "cross-chain"
     print(f"\nDeFi Yield Scout \u2014 Breakeven Analysis")
-    print("\u2501" * 70)
+    print(RULE_MID)
     print(f"  FROM: {pool_a.get('project')} / {pool_a.get('symbol')} ({chain_a})")
     print(f"        APY: {fmt_pct(apy_a)}")
     print(f"  TO:   {pool_b.get('project')} / {pool_b.get('symbol')} ({chain_b})")
     print(f"        APY: {fmt_pct(apy_b)}")
-    print("\u2501" * 70)
+    print(RULE_MID)
     print(f"  Amount:          {fmt_usd(amount)}")
     print(f"  Move type:       {move_type}")
     print(f"  Est. cost:       {fmt_usd(cost)} ({cost_rate * 100:.0f}% of amount)")
@@ -353,7 +754,7 @@ def cmd_breakeven(args):
         print(f"  Breakeven:       NEVER (target APY is not higher)")
     else:
         print(f"  Breakeven:       {breakeven_days:.0f} days")
-    print("\u2501" * 70)
+    print(RULE_MID)
     tag = {"GO": "\u2705 GO", "MAYBE": "\u26a0\ufe0f  MAYBE", "NO-GO": "\u274c NO-GO"}
     print(f"  Verdict:         {tag[verdict]}")
     print()
@@ -366,11 +767,9 @@ def cmd_breakeven(args):
 
 def cmd_history(args):
     pool_id = args.pool
-    url = CHART_URL.format(pool_id=pool_id)
 
     print(f"Fetching 30-day history for {pool_id[:16]}...", file=sys.stderr)
-    data = fetch_json(url)
-    points = data.get("data", data) if isinstance(data, dict) else data
+    points = fetch_history(pool_id)
 
     if not points:
         print("No historical data found for this pool.", file=sys.stderr)
@@ -382,14 +781,25 @@ def cmd_history(args):
     tvls = [p.get("tvlUsd", 0) or 0 for p in recent]
     dates = [p.get("timestamp", "")[:10] for p in recent]
 
-    avg_apy = sum(apys) / len(apys) if apys else 0
-    min_apy = min(apys) if apys else 0
-    max_apy = max(apys) if apys else 0
+    if np is not None and apys:
+        # Single vectorized pass instead of four interpreter loops
+        arr = np.asarray(apys, dtype=np.float64)
+        avg_apy = float(arr.mean())
+        min_apy = float(arr.min())
+        max_apy = float(arr.max())
+    else:
+        arr = None
+        avg_apy = sum(apys) / len(apys) if apys else 0
+        min_apy = min(apys) if apys else 0
+        max_apy = max(apys) if apys else 0
 
     # Stability score: based on coefficient of variation
     if avg_apy > 0 and len(apys) > 1:
-        variance = sum((a - avg_apy) ** 2 for a in apys) / len(apys)
-        std_dev = math.sqrt(variance)
+        if arr is not None:
+            std_dev = float(arr.std())
+        else:
+            variance = sum((a - avg_apy) ** 2 for a in apys) / len(apys)
+            std_dev = math.sqrt(variance)
         cv = std_dev / avg_apy
         if cv < 0.1:
             stability = "STABLE"
@@ -416,7 +826,7 @@ def cmd_history(args):
         tvl_trend = "N/A"
 
     if args.json:
-        print(json.dumps({
+        _json_out({
             "pool": pool_id,
             "days": len(recent),
             "current_apy": apys[-1] if apys else None,
@@ -429,133 +839,144 @@ def cmd_history(args):
             "tvl_trend": tvl_trend,
             "sparkline": sparkline(apys),
             "data": [{"date": d, "apy": a, "tvl": t} for d, a, t in zip(dates, apys, tvls)],
-        }, indent=2))
+        })
         return
 
-    print(f"\nDeFi Yield Scout \u2014 30-Day APY History")
-    print("\u2501" * 60)
-    print(f"  Pool:          {pool_id}")
-    print(f"  Period:        {dates[0] if dates else '?'} \u2192 {dates[-1] if dates else '?'}")
-    print(f"  Current APY:   {fmt_pct(apys[-1] if apys else 0)}")
-    print(f"  Average APY:   {fmt_pct(avg_apy)}")
-    print(f"  Min APY:       {fmt_pct(min_apy)}")
-    print(f"  Max APY:       {fmt_pct(max_apy)}")
-    print(f"  Std Dev:       {std_dev:.4f}")
-    print(f"  Stability:     {stability}")
-    print(f"  TVL Current:   {fmt_usd(tvls[-1] if tvls else 0)}")
-    print(f"  TVL Trend:     {tvl_trend}")
-    print("\u2501" * 60)
-    print(f"  APY Trend:     {sparkline(apys)}")
-    print()
+    sys.stdout.write("\n".join([
+        f"\nDeFi Yield Scout \u2014 30-Day APY History",
+        RULE_NARROW,
+        f"  Pool:          {pool_id}",
+        f"  Period:        {dates[0] if dates else '?'} \u2192 {dates[-1] if dates else '?'}",
+        f"  Current APY:   {fmt_pct(apys[-1] if apys else 0)}",
+        f"  Average APY:   {fmt_pct(avg_apy)}",
+        f"  Min APY:       {fmt_pct(min_apy)}",
+        f"  Max APY:       {fmt_pct(max_apy)}",
+        f"  Std Dev:       {std_dev:.4f}",
+        f"  Stability:     {stability}",
+        f"  TVL Current:   {fmt_usd(tvls[-1] if tvls else 0)}",
+        f"  TVL Trend:     {tvl_trend}",
+        RULE_NARROW,
+        f"  APY Trend:     {sparkline(apys)}",
+        "",
+    ]) + "\n")
 
 
 # ---------------------------------------------------------------------------
 # Subcommand: protocols
 # ---------------------------------------------------------------------------
 
-PROTOCOL_INFO = {
-    "morpho-v1": {
-        "name": "Morpho",
-        "chains": ["Base", "Arbitrum"],
-        "vault_standard": "ERC-4626",
-        "audits": "Spearbit, Trail of Bits, Cantina",
-        "risk_notes": "Non-custodial, immutable markets. Curated vaults add a layer of risk management.",
-    },
-    "euler-v2": {
-        "name": "Euler v2",
-        "chains": ["Base", "Arbitrum"],
-        "vault_standard": "ERC-4626",
-        "audits": "Spearbit, Certora, Trail of Bits",
-        "risk_notes": "Modular vault system. v2 is a full rewrite after v1 exploit. Formal verification.",
-    },
-    "lazy-summer-protocol": {
-        "name": "Lazy Summer",
-        "chains": ["Base"],
-        "vault_standard": "ERC-4626",
-        "audits": "Community audited",
-        "risk_notes": "Yield aggregator on Base. Allocates across underlying protocols.",
-    },
-    "silo-v2": {
-        "name": "Silo v2",
-        "chains": ["Base", "Arbitrum"],
-        "vault_standard": "Custom (isolated markets)",
-        "audits": "ABDK, Quantstamp",
-        "risk_notes": "Isolated lending markets — risk is contained per pair.",
-    },
-    "moonwell-lending": {
-        "name": "Moonwell",
-        "chains": ["Base"],
-        "vault_standard": "cToken (Compound-style)",
-        "audits": "Halborn, Code4rena",
-        "risk_notes": "Fork of Compound/Moonbeam. Governance-managed parameters.",
-    },
-    "compound-v3": {
-        "name": "Compound v3",
-        "chains": ["Base", "Arbitrum"],
-        "vault_standard": "Comet (single-asset)",
-        "audits": "OpenZeppelin, Trail of Bits, ChainSecurity",
-        "risk_notes": "Battle-tested. Single-borrowable-asset model. COMP rewards may fluctuate.",
-    },
-    "aave-v3": {
-        "name": "Aave v3",
-        "chains": ["Base", "Arbitrum"],
-        "vault_standard": "aToken (rebasing)",
-        "audits": "SigmaPrime, Trail of Bits, Certora",
-        "risk_notes": "Largest DeFi lending protocol. E-mode, isolation mode for risk segmentation.",
-    },
-    "harvest-finance": {
-        "name": "Harvest Finance",
-        "chains": ["Base", "Arbitrum"],
-        "vault_standard": "Custom (fToken)",
-        "audits": "Haechi, PeckShield",
-        "risk_notes": "Yield aggregator. Auto-compounds. Strategy risk depends on underlying.",
-    },
-    "40-acres": {
-        "name": "40 Acres",
-        "chains": ["Base"],
-        "vault_standard": "ERC-4626",
-        "audits": "Community audited",
-        "risk_notes": "Newer protocol. Lower TVL — higher smart contract risk.",
-    },
-    "wasabi-protocol": {
-        "name": "Wasabi",
-        "chains": ["Arbitrum"],
-        "vault_standard": "Custom",
-        "audits": "Community audited",
-        "risk_notes": "Options/perps protocol. Yield from options premiums.",
-    },
-    "yo-protocol": {
-        "name": "Yo Protocol",
-        "chains": ["Base"],
-        "vault_standard": "Custom",
-        "audits": "Community audited",
-        "risk_notes": "Newer protocol. Lower TVL — verify before large deposits.",
-    },
-}
+@functools.cache
+def _protocol_info():
+    # Built lazily: only cmd_protocols needs this, so the hot scan and
+    # breakeven paths never materialize the dict.
+    return {
+        "morpho-v1": {
+            "name": "Morpho",
+            "chains": ["Base", "Arbitrum"],
+            "vault_standard": "ERC-4626",
+            "audits": "Spearbit, Trail of Bits, Cantina",
+            "risk_notes": "Non-custodial, immutable markets. Curated vaults add a layer of risk management.",
+        },
+        "euler-v2": {
+            "name": "Euler v2",
+            "chains": ["Base", "Arbitrum"],
+            "vault_standard": "ERC-4626",
+            "audits": "Spearbit, Certora, Trail of Bits",
+            "risk_notes": "Modular vault system. v2 is a full rewrite after v1 exploit. Formal verification.",
+        },
+        "lazy-summer-protocol": {
+            "name": "Lazy Summer",
+            "chains": ["Base"],
+            "vault_standard": "ERC-4626",
+            "audits": "Community audited",
+            "risk_notes": "Yield aggregator on Base. Allocates across underlying protocols.",
+        },
+        "silo-v2": {
+            "name": "Silo v2",
+            "chains": ["Base", "Arbitrum"],
+            "vault_standard": "Custom (isolated markets)",
+            "audits": "ABDK, Quantstamp",
+            "risk_notes": "Isolated lending markets — risk is contained per pair.",
+        },
+        "moonwell-lending": {
+            "name": "Moonwell",
+            "chains": ["Base"],
+            "vault_standard": "cToken (Compound-style)",
+            "audits": "Halborn, Code4rena",
+            "risk_notes": "Fork of Compound/Moonbeam. Governance-managed parameters.",
+        },
+        "compound-v3": {
+            "name": "Compound v3",
+            "chains": ["Base", "Arbitrum"],
+            "vault_standard": "Comet (single-asset)",
+            "audits": "OpenZeppelin, Trail of Bits, ChainSecurity",
+            "risk_notes": "Battle-tested. Single-borrowable-asset model. COMP rewards may fluctuate.",
+        },
+        "aave-v3": {
+            "name": "Aave v3",
+            "chains": ["Base", "Arbitrum"],
+            "vault_standard": "aToken (rebasing)",
+            "audits": "SigmaPrime, Trail of Bits, Certora",
+            "risk_notes": "Largest DeFi lending protocol. E-mode, isolation mode for risk segmentation.",
+        },
+        "harvest-finance": {
+            "name": "Harvest Finance",
+            "chains": ["Base", "Arbitrum"],
+            "vault_standard": "Custom (fToken)",
+            "audits": "Haechi, PeckShield",
+            "risk_notes": "Yield aggregator. Auto-compounds. Strategy risk depends on underlying.",
+        },
+        "40-acres": {
+            "name": "40 Acres",
+            "chains": ["Base"],
+            "vault_standard": "ERC-4626",
+            "audits": "Community audited",
+            "risk_notes": "Newer protocol. Lower TVL — higher smart contract risk.",
+        },
+        "wasabi-protocol": {
+            "name": "Wasabi",
+            "chains": ["Arbitrum"],
+            "vault_standard": "Custom",
+            "audits": "Community audited",
+            "risk_notes": "Options/perps protocol. Yield from options premiums.",
+        },
+        "yo-protocol": {
+            "name": "Yo Protocol",
+            "chains": ["Base"],
+            "vault_standard": "Custom",
+            "audits": "Community audited",
+            "risk_notes": "Newer protocol. Lower TVL — verify before large deposits.",
+        },
+    }
+
+
+@functools.cache
+def _protocol_table():
+    # Rows for the human-readable table, formatted once on first use
+    # (sorted by slug, same order the old per-call sorted() produced).
+    return [
+        (info["name"], ", ".join(info["chains"]), info["vault_standard"], info["audits"])
+        for _, info in sorted(_protocol_info().items())
+    ]
 
 
 def cmd_protocols(args):
     if args.json:
-        print(json.dumps(PROTOCOL_INFO, indent=2))
+        _json_out(_protocol_info())
         return
 
-    print(f"\nDeFi Yield Scout \u2014 Whitelisted Protocols")
-    print("\u2501" * 100)
-    hdr = f"  {'Protocol':<22} {'Chains':<20} {'Vault Standard':<26} {'Audits':<30}"
-    print(hdr)
-    print("\u2501" * 100)
-
-    for slug in sorted(PROTOCOL_INFO):
-        info = PROTOCOL_INFO[slug]
-        chains = ", ".join(info["chains"])
-        print(
-            f"  {info['name']:<22} "
-            f"{chains:<20} "
-            f"{info['vault_standard']:<26} "
-            f"{info['audits']:<30}"
-        )
-
-    print(f"\n{len(PROTOCOL_INFO)} protocols. See references/protocols.md for detailed risk notes.")
+    lines = [
+        f"\nDeFi Yield Scout \u2014 Whitelisted Protocols",
+        RULE_WIDE,
+        f"  {'Protocol':<22} {'Chains':<20} {'Vault Standard':<26} {'Audits':<30}",
+        RULE_WIDE,
+    ]
+    lines.extend(
+        _PROTO_ROW_FMT.format(name=name, chains=chains, standard=standard, audits=audits)
+        for name, chains, standard, audits in _protocol_table()
+    )
+    lines.append(f"\n{len(_protocol_table())} protocols. See references/protocols.md for detailed risk notes.")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 # ---------------------------------------------------------------------------
@@ -576,6 +997,8 @@ def main():
     p_scan.add_argument("--protocol", help="Filter by protocol slug")
     p_scan.add_argument("--min-tvl", type=float, default=0, help="Minimum TVL in USD")
     p_scan.add_argument("--top", type=int, default=20, help="Number of results")
+    p_scan.add_argument("--enrich", action="store_true",
+                        help="Fetch 30-day history for each result (adds APY trend)")
     p_scan.add_argument("--json", action="store_true", help="JSON output")
 
     # breakeven